@@ -98,6 +98,9 @@ DB_NAME = config("DB_NAME", default="Andgate_Portal")
 client = pymongo.MongoClient(MONGO_URI)
 db = client[DB_NAME]
 
+# Local Chroma store and search state (see hrmatch/snapshot.py)
+VECTOR_DB_PATH = config("VECTOR_DB_PATH", default="chatbot/vector_data")
+
 
 
 # Password validation
@@ -152,3 +155,19 @@ TEMPLATES[0]['DIRS'] = [BASE_DIR / 'Andgate_Portal' / 'templates']
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Logging
+# hrmatch reports per-call LLM time-to-first-token and token counts at INFO.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'hrmatch': {
+            'handlers': ['console'],
+            'level': config('HRMATCH_LOG_LEVEL', default='INFO'),
+        },
+    },
+}
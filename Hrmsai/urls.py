@@ -21,5 +21,6 @@ from hrmatch.views import *
 urlpatterns = [
     path('admin/', admin.site.urls),
     path("candidates/search", HRSearchAPIView.as_view(), name="candidate-search"),
+    path("candidates/search/batch", HRBatchSearchAPIView.as_view(), name="candidate-search-batch"),
     # path("screening", LiveInterviewLipSyncAPIView.as_view(), name="candidate-search"),
 ]
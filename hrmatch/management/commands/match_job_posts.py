@@ -0,0 +1,47 @@
+import json
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from hrmatch.utils import MAX_RECENT_DAYS, RECENT_DAYS, db, search_candidates_batch
+
+
+def job_post_requirement(job: dict) -> dict:
+    skills = [s for s in job.get("skills") or [] if s and s.strip()]
+    query = " ".join(part for part in [
+        job.get("title", ""),
+        ", ".join(skills),
+        job.get("description", ""),
+    ] if part).strip()
+    return {"id": str(job["_id"]), "query": query, "skills": skills}
+
+
+class Command(BaseCommand):
+    help = "Match job posts against the resume pool and write one NDJSON line of ranked candidates per post."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--status", default="Active", help="Job post status to match (default: Active).")
+        parser.add_argument("--top-k", type=int, default=20, help="Candidates returned per job post.")
+        parser.add_argument("--recent-days", type=int, default=RECENT_DAYS, help="Only match resumes updated within this many days.")
+        parser.add_argument("--output", help="Write NDJSON to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        if not 1 <= options["recent_days"] <= MAX_RECENT_DAYS:
+            raise CommandError(f"--recent-days must be between 1 and {MAX_RECENT_DAYS}.")
+
+        jobs = db["jobs"].find(
+            {"status": options["status"]},
+            {"title": 1, "skills": 1, "description": 1}
+        )
+        requirements = [job_post_requirement(job) for job in jobs]
+
+        out = open(options["output"], "w", encoding="utf-8") if options["output"] else sys.stdout
+        try:
+            for item in search_candidates_batch(
+                requirements, top_k=options["top_k"], recent_days=options["recent_days"]
+            ):
+                out.write(json.dumps(item, default=str) + "\n")
+                out.flush()
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+        self.stderr.write(f"Matched {len(requirements)} job posts.")
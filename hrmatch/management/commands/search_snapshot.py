@@ -0,0 +1,65 @@
+import tarfile
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from hrmatch import snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Export the search state (vector index, chunk metadata, parsed texts, candidate features, "
+        "skill vocabulary, sync watermark) to a snapshot, or import one on a new node. "
+        "Import with the server stopped; on start it catches up from the snapshot's watermark."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["export", "import"])
+        parser.add_argument("path", help="Snapshot file (.tar.gz).")
+
+    def handle(self, *args, **options):
+        if options["action"] == "export":
+            self.export(options["path"])
+        else:
+            self.restore(options["path"])
+
+    def export(self, path):
+        # Imported here: loading hrmatch.utils opens and syncs the local store.
+        from chatbot.offline_loader import EMBED_MODEL_DIR
+        from hrmatch import utils
+
+        if utils.vector_db is None:
+            raise CommandError("Vector DB failed to initialise; see the logged initialization error.")
+
+        utils.materialize_recency_window()
+        utils.save_search_state()
+        utils.vector_db.persist()
+
+        manifest = snapshot.write_snapshot(path, utils.VECTOR_DB_PATH, {
+            "watermark": utils.sync_watermark.isoformat() if utils.sync_watermark else None,
+            "embedding_model": EMBED_MODEL_DIR.name,
+            "chunks": utils.vector_db._collection.count(),
+            "candidates": len(utils.candidate_index),
+            "features": sum(1 for f in utils.candidate_features.values() if f),
+        })
+        self.stdout.write(
+            f"Exported {manifest['chunks']} chunks / {manifest['candidates']} candidates to {path} "
+            f"(watermark {manifest['watermark']})."
+        )
+
+    def restore(self, path):
+        from chatbot.offline_loader import EMBED_MODEL_DIR
+
+        try:
+            manifest = snapshot.read_manifest(path)
+            if manifest.get("embedding_model") != EMBED_MODEL_DIR.name:
+                raise CommandError(
+                    f"Snapshot was built with embedding model {manifest.get('embedding_model')!r}, "
+                    f"this node uses {EMBED_MODEL_DIR.name!r}."
+                )
+            manifest = snapshot.restore_snapshot(path, settings.VECTOR_DB_PATH)
+        except (OSError, ValueError, KeyError, tarfile.TarError) as e:
+            raise CommandError(f"Import failed: {e}")
+
+        self.stdout.write(
+            f"Imported snapshot from {manifest['created_at']} into {settings.VECTOR_DB_PATH} "
+            f"(watermark {manifest.get('watermark')})."
+        )
@@ -0,0 +1,170 @@
+import re
+
+# ============================================================
+# Skill Vocabulary
+# ============================================================
+# canonical skill -> aliases normalised onto it
+SKILL_SYNONYMS = {
+    "systemverilog": ["sv", "system verilog"],
+    "verilog": ["verilog hdl"],
+    "vhdl": [],
+    "uvm": ["universal verification methodology"],
+    "ovm": [],
+    "rtl design": ["rtl"],
+    "functional verification": [],
+    "formal verification": [],
+    "static timing analysis": ["sta"],
+    "design for testability": ["dft"],
+    "physical design": [],
+    "synthesis": [],
+    "fpga": [],
+    "asic": [],
+    "soc": ["system on chip"],
+    "amba": [],
+    "axi": [],
+    "ahb": [],
+    "apb": [],
+    "i2c": ["iic"],
+    "spi": [],
+    "uart": [],
+    "usb": [],
+    "pcie": ["pci express"],
+    "ethernet": [],
+    "ddr": [],
+    "tcl": [],
+    "perl": [],
+    "python": [],
+    "c++": ["cpp"],
+    "c#": ["csharp"],
+    "java": [],
+    "javascript": ["js"],
+    "typescript": [],
+    "node.js": ["nodejs"],
+    "react": ["reactjs", "react.js"],
+    "django": [],
+    "sql": [],
+    "mongodb": ["mongo"],
+    "docker": [],
+    "kubernetes": ["k8s"],
+    "aws": [],
+    "linux": [],
+    "git": [],
+    "machine learning": ["ml"],
+}
+
+# Stop words, section headers and boilerplate that must never be mined as skills
+RESUME_NOISE = frozenset([
+    "b.tech", "m.tech", "b.e", "m.e", "b.sc", "m.sc", "cgpa", "sgpa", "gpa", "pvt", "ltd",
+    "llc", "inc", "i.e", "e.g", "etc", "ssc", "hsc", "cbse", "dob", "mob", "hr", "ii", "iii", "iv",
+    "of", "in", "and", "the", "for", "with", "to", "at", "on", "by",
+    "skills", "projects", "project", "education", "experience", "summary", "objective", "profile",
+    "certifications", "achievements", "declaration", "languages", "hobbies", "interests",
+    "references", "internship", "technical", "personal", "details", "bachelor", "master",
+    "technology", "engineering", "electronics", "communication", "linkedin", "gmail", "email",
+    "phone", "mobile", "address",
+])
+SKILL_MIN_DF = 2
+SKILL_MIN_LEN = 3
+
+# Tokens keep in-word "." "+" "#" (node.js, c++, c#); "/" and "-" separate
+# tokens so lists like "AXI/AHB/APB" and "UVM-based" yield each skill.
+_TOKEN_RE = re.compile(r"[a-z0-9](?:[a-z0-9\+\#\.]*[a-z0-9\+\#])?")
+# Only mine tokens shaped like technology names: letters with a digit
+# ("AXI4", "LPDDR5", "I2C") or mixed case ("PyTorch", "SystemC").
+_MINED_TERM_RE = re.compile(r"\b(?:[A-Za-z]+[0-9][A-Za-z0-9]*|[A-Za-z]*[a-z][A-Z][A-Za-z0-9]*)\b")
+
+
+def tokenize(text: str):
+    return _TOKEN_RE.findall(text.lower())
+
+
+class SkillVocabulary:
+    """
+    Hash-based longest-match skill lookup. Phrases are stored as token tuples
+    mapping to a canonical skill; extraction is a single left-to-right pass.
+    Besides the SKILL_SYNONYMS seed, alphanumeric and mixed-case terms (e.g.
+    "AXI4", "LPDDR5", "PyTorch") seen in at least SKILL_MIN_DF resumes are
+    mined in.
+    """
+
+    def __init__(self, synonyms: dict):
+        self.phrases = {}
+        self.skills = set()
+        self.max_len = 1
+        self.version = 0
+        self.doc_freq = {}
+        self.documents = set()
+        self.mined = set()
+        for canonical, aliases in synonyms.items():
+            self.add_skill(canonical, aliases)
+
+    def add_skill(self, canonical: str, aliases: list = ()):
+        canonical = canonical.lower().strip()
+        for phrase in [canonical, *aliases]:
+            key = tuple(tokenize(phrase))
+            if key and key not in self.phrases:
+                self.phrases[key] = canonical
+                self.max_len = max(self.max_len, len(key))
+        if canonical not in self.skills:
+            self.skills.add(canonical)
+            self.version += 1
+
+    def add_document(self, doc_id: str, text: str):
+        """Count mined terms of one resume; promote those reaching SKILL_MIN_DF."""
+        if doc_id in self.documents or not text:
+            return
+        self.documents.add(doc_id)
+        for term in set(m.lower() for m in _MINED_TERM_RE.findall(text)):
+            if len(term) < SKILL_MIN_LEN or term in RESUME_NOISE:
+                continue
+            self.doc_freq[term] = self.doc_freq.get(term, 0) + 1
+            if self.doc_freq[term] == SKILL_MIN_DF and (term,) not in self.phrases:
+                self.mined.add(term)
+                self.add_skill(term)
+
+    def to_state(self) -> dict:
+        return {
+            "mined": sorted(self.mined),
+            "doc_freq": dict(self.doc_freq),
+            "documents": sorted(self.documents),
+        }
+
+    def load_state(self, state: dict):
+        for term in state.get("mined", []):
+            self.mined.add(term)
+            self.add_skill(term)
+        self.doc_freq.update(state.get("doc_freq", {}))
+        self.documents.update(state.get("documents", []))
+
+    def normalize(self, phrase: str) -> str:
+        phrase = phrase.lower().strip()
+        return self.phrases.get(tuple(tokenize(phrase)), phrase)
+
+    def extract(self, text: str):
+        tokens = tokenize(text)
+        found = {}
+        i = 0
+        while i < len(tokens):
+            for n in range(min(self.max_len, len(tokens) - i), 0, -1):
+                canonical = self.phrases.get(tuple(tokens[i:i + n]))
+                if canonical:
+                    found[canonical] = None
+                    i += n
+                    break
+            else:
+                i += 1
+        return list(found)
+
+
+def matches_any_skill(skills: list, known_skills: set, candidate_skills: set, content_lower: str) -> bool:
+    """
+    True if the resume has any of `skills`. Vocabulary skills are checked
+    against the resume's extracted skill set; anything else falls back to a
+    word-boundary regex over the resume text.
+    """
+    if candidate_skills.intersection(s for s in skills if s in known_skills):
+        return True
+    return any(
+        re.search(r'\b' + re.escape(s) + r'\b', content_lower)
+        for s in skills if s not in known_skills
+    )
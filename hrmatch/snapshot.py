@@ -0,0 +1,158 @@
+import io
+import os
+import json
+import gzip
+import shutil
+import tarfile
+import tempfile
+from datetime import datetime
+
+# ============================================================
+# Search Snapshot Format
+# ============================================================
+# A snapshot is a gzip-compressed tar holding manifest.json plus the whole
+# local vector store directory: the Chroma files (HNSW index + chunk
+# metadata in sqlite) and the search state file written by hrmatch.utils
+# (candidate index, parsed texts/features, skill vocabulary, sync watermark).
+SNAPSHOT_FORMAT = "hrmatch-search-snapshot"
+SNAPSHOT_VERSION = 1
+SEARCH_STATE_FILE = "search_state.json.gz"
+MANIFEST_FILE = "manifest.json"
+VECTOR_DATA_DIR = "vector_data"
+
+
+def write_state_file(path: str, state: dict):
+    """Atomically write a gzip JSON state file."""
+    tmp_path = path + ".tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def read_state_file(path: str):
+    if not os.path.exists(path):
+        return None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def dump_search_state(watermark, last_id, candidate_index: dict, candidate_features: dict, vocab) -> dict:
+    """Serialise the in-memory search tables of hrmatch.utils to plain JSON types."""
+    def iso(value):
+        return value.isoformat() if value else None
+
+    return {
+        "version": SNAPSHOT_VERSION,
+        "watermark": iso(watermark),
+        "last_id": last_id,
+        "candidate_index": {
+            uid: {**entry, "updated_at": iso(entry["updated_at"])}
+            for uid, entry in candidate_index.items()
+        },
+        "candidate_features": {
+            uid: {**feature, "skills": sorted(feature["skills"])} if feature else None
+            for uid, feature in candidate_features.items()
+        },
+        "skill_vocab": vocab.to_state(),
+    }
+
+
+def apply_search_state(state: dict, candidate_index: dict, candidate_features: dict, vocab):
+    """Load a dumped state into the given tables; returns (watermark, last_id)."""
+    if state.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported search state version {state.get('version')}")
+
+    def parse(value):
+        return datetime.fromisoformat(value) if value else None
+
+    vocab.load_state(state.get("skill_vocab", {}))
+
+    candidate_index.clear()
+    for uid, entry in state.get("candidate_index", {}).items():
+        candidate_index[uid] = {**entry, "updated_at": parse(entry["updated_at"])}
+
+    # Saved skill sets may predate terms mined later in the same sync, so every
+    # restored row is marked stale (-1) and re-extracted on first use.
+    candidate_features.clear()
+    for uid, feature in state.get("candidate_features", {}).items():
+        candidate_features[uid] = {
+            **feature, "skills": set(feature["skills"]), "vocab_version": -1
+        } if feature else None
+
+    return parse(state.get("watermark")), state.get("last_id")
+
+
+def write_snapshot(output_path: str, vector_db_path: str, info: dict = None) -> dict:
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.utcnow().isoformat(),
+        **(info or {})
+    }
+
+    with tarfile.open(output_path, "w:gz") as tar:
+        data = json.dumps(manifest, indent=2).encode("utf-8")
+        member = tarfile.TarInfo(MANIFEST_FILE)
+        member.size = len(data)
+        member.mtime = int(datetime.utcnow().timestamp())
+        tar.addfile(member, io.BytesIO(data))
+        tar.add(vector_db_path, arcname=VECTOR_DATA_DIR)
+
+    return manifest
+
+
+def read_manifest(snapshot_path: str) -> dict:
+    with tarfile.open(snapshot_path, "r:gz") as tar:
+        f = tar.extractfile(MANIFEST_FILE)
+        manifest = json.load(f)
+
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"{snapshot_path} is not a search snapshot")
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"Unsupported snapshot version {manifest.get('version')} (expected {SNAPSHOT_VERSION})"
+        )
+    return manifest
+
+
+def restore_snapshot(snapshot_path: str, vector_db_path: str) -> dict:
+    """
+    Unpack a snapshot in place of `vector_db_path`. The new store is extracted
+    next to the old one and swapped in with renames, so a failed import leaves
+    the existing store untouched. Must not run while a server uses the store.
+    """
+    manifest = read_manifest(snapshot_path)
+    target = os.path.abspath(vector_db_path)
+    parent = os.path.dirname(target)
+    os.makedirs(parent, exist_ok=True)
+
+    staging = tempfile.mkdtemp(prefix=".snapshot-", dir=parent)
+    try:
+        with tarfile.open(snapshot_path, "r:gz") as tar:
+            members = [m for m in tar.getmembers() if m.name.startswith(VECTOR_DATA_DIR + "/")]
+            for m in members:
+                if os.path.isabs(m.name) or ".." in m.name.split("/") or not (m.isfile() or m.isdir()):
+                    raise ValueError(f"Unsafe path in snapshot: {m.name}")
+            tar.extractall(staging, members=members)
+
+        staged = os.path.join(staging, VECTOR_DATA_DIR)
+        if not os.path.isfile(os.path.join(staged, SEARCH_STATE_FILE)):
+            raise ValueError(f"{snapshot_path} has no {SEARCH_STATE_FILE}")
+
+        backup = None
+        if os.path.exists(target):
+            backup = target + ".bak"
+            shutil.rmtree(backup, ignore_errors=True)
+            os.replace(target, backup)
+        try:
+            os.replace(staged, target)
+        except OSError:
+            if backup:
+                os.replace(backup, target)
+            raise
+        if backup:
+            shutil.rmtree(backup, ignore_errors=True)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    return manifest
@@ -1,3 +1,217 @@
-from django.test import TestCase
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+from datetime import datetime
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from hrmatch import snapshot
+from hrmatch.skills import SKILL_SYNONYMS, SkillVocabulary, matches_any_skill, tokenize
+
+
+class TokenizeTests(SimpleTestCase):
+    def test_keeps_in_word_symbols(self):
+        self.assertEqual(tokenize("Node.js, C++ and C#."), ["node.js", "c++", "and", "c#"])
+
+    def test_splits_slash_and_hyphen_lists(self):
+        self.assertEqual(tokenize("Verilog/SystemVerilog"), ["verilog", "systemverilog"])
+        self.assertEqual(tokenize("AXI/AHB/APB"), ["axi", "ahb", "apb"])
+        self.assertEqual(tokenize("UVM-based C/C++"), ["uvm", "based", "c", "c++"])
+
+
+class SkillVocabularyTests(SimpleTestCase):
+    def setUp(self):
+        self.vocab = SkillVocabulary(SKILL_SYNONYMS)
+
+    def test_longest_match_wins(self):
+        self.assertEqual(self.vocab.extract("static timing analysis and rtl"), ["static timing analysis", "rtl design"])
+        self.assertEqual(self.vocab.extract("system verilog"), ["systemverilog"])
+
+    def test_synonyms_normalise_to_canonical(self):
+        self.assertEqual(self.vocab.normalize("SV"), "systemverilog")
+        self.assertEqual(self.vocab.normalize("Universal Verification Methodology"), "uvm")
+        self.assertEqual(self.vocab.normalize("not a skill"), "not a skill")
+
+    def test_extracts_slash_and_hyphen_lists(self):
+        text = "Skills: Verilog/SystemVerilog, UVM-based TB, AXI/AHB/APB, C/C++, Python"
+        self.assertEqual(
+            set(self.vocab.extract(text)),
+            {"verilog", "systemverilog", "uvm", "axi", "ahb", "apb", "c++", "python"},
+        )
+
+    def test_ambiguous_aliases_are_not_skills(self):
+        self.assertEqual(self.vocab.extract("28nm technology node, grade C"), [])
+
+    def test_only_generic_words_yield_nothing(self):
+        self.assertEqual(self.vocab.extract("Find top 5 candidates with 3 years of experience in projects"), [])
+
+    def test_mines_technical_terms_only(self):
+        resume = "BACHELOR OF TECHNOLOGY IN ELECTRONICS\nSKILLS\nAXI4, LPDDR5, PyTorch\nPROJECTS\nQ3 IN OF"
+        self.vocab.add_document("a", resume)
+        self.assertEqual(self.vocab.extract("axi4 lpddr5 pytorch"), [])
+        self.vocab.add_document("b", resume)
+        self.vocab.add_document("b", resume)
+
+        self.assertEqual(self.vocab.doc_freq["axi4"], 2)
+        self.assertEqual(set(self.vocab.extract("axi4 lpddr5 pytorch")), {"axi4", "lpddr5", "pytorch"})
+        for noise in ["in", "of", "skills", "projects", "q3", "bachelor"]:
+            self.assertNotIn(noise, self.vocab.skills)
+        self.assertEqual(
+            self.vocab.extract("Find top 5 candidates with 3 years of experience in verilog and projects"),
+            ["verilog"],
+        )
+
+
+class MatchesAnySkillTests(SimpleTestCase):
+    def setUp(self):
+        self.vocab = SkillVocabulary(SKILL_SYNONYMS)
+        self.content = "worked on uvm-based testbenches for axi/ahb; scripting in tcl. knows cadence xcelium"
+        self.candidate_skills = set(self.vocab.extract(self.content))
+
+    def test_known_skill_matches_by_set(self):
+        self.assertTrue(matches_any_skill(["axi"], self.vocab.skills, self.candidate_skills, self.content))
+        self.assertFalse(matches_any_skill(["vhdl"], self.vocab.skills, self.candidate_skills, self.content))
+
+    def test_known_skill_does_not_use_regex(self):
+        # "uvm" is a known skill, so only the extracted set counts
+        self.assertFalse(matches_any_skill(["uvm"], self.vocab.skills, set(), self.content))
+
+    def test_unknown_skill_falls_back_to_regex(self):
+        self.assertTrue(matches_any_skill(["xcelium"], self.vocab.skills, self.candidate_skills, self.content))
+        self.assertFalse(matches_any_skill(["vcs"], self.vocab.skills, self.candidate_skills, self.content))
+
+
+class SearchStateTests(SimpleTestCase):
+    def test_round_trip(self):
+        vocab = SkillVocabulary(SKILL_SYNONYMS)
+        vocab.add_document("a", "AXI4 bridge")
+        vocab.add_document("b", "AXI4 monitor")
+        updated_at = datetime(2026, 10, 1, 12, 30)
+        index = {"a": {"filename": "a.pdf", "file_path": "/x/a.pdf", "updated_at": updated_at, "updated_ts": 1.5}}
+        features = {
+            "a": {"content_lower": "axi4 and sv", "experience_years": 3.0, "skills": {"axi4", "systemverilog"},
+                  "vocab_version": vocab.version, "updated_ts": 1.5},
+            "b": None,
+        }
+
+        state = snapshot.dump_search_state(updated_at, "0123456789abcdef01234567", index, features, vocab)
+        restored_vocab = SkillVocabulary(SKILL_SYNONYMS)
+        restored_index, restored_features = {"stale": {}}, {}
+        watermark, last_id = snapshot.apply_search_state(
+            json.loads(json.dumps(state)), restored_index, restored_features, restored_vocab
+        )
+
+        self.assertEqual((watermark, last_id), (updated_at, "0123456789abcdef01234567"))
+        self.assertEqual(restored_index, index)
+        self.assertEqual(restored_features["a"]["skills"], {"axi4", "systemverilog"})
+        self.assertEqual(restored_features["a"]["vocab_version"], -1)
+        self.assertIsNone(restored_features["b"])
+        self.assertEqual(restored_vocab.mined, {"axi4"})
+        self.assertEqual(restored_vocab.extract("axi4"), ["axi4"])
+        self.assertEqual(restored_vocab.documents, {"a", "b"})
+
+    def test_skill_mined_after_row_was_stored(self):
+        vocab = SkillVocabulary(SKILL_SYNONYMS)
+        vocab.add_document("a", "AXI4 bridge")
+        # Row for "a" is built before "axi4" is promoted by resume "b"
+        features = {"a": {"content_lower": "axi4 bridge", "experience_years": 1.0,
+                          "skills": set(vocab.extract("axi4 bridge")), "vocab_version": vocab.version,
+                          "updated_ts": 1.0}}
+        vocab.add_document("b", "AXI4 monitor")
+        self.assertEqual(features["a"]["skills"], set())
+
+        state = json.loads(json.dumps(snapshot.dump_search_state(None, None, {}, features, vocab)))
+        restored_vocab = SkillVocabulary(SKILL_SYNONYMS)
+        restored_features = {}
+        snapshot.apply_search_state(state, {}, restored_features, restored_vocab)
+
+        row = restored_features["a"]
+        self.assertNotEqual(row["vocab_version"], restored_vocab.version)
+        skills = set(restored_vocab.extract(row["content_lower"]))
+        self.assertTrue(matches_any_skill(["axi4"], restored_vocab.skills, skills, row["content_lower"]))
+
+    def test_rejects_unknown_version(self):
+        with self.assertRaises(ValueError):
+            snapshot.apply_search_state({"version": 99}, {}, {}, SkillVocabulary({}))
+
+
+class SnapshotArchiveTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.source = os.path.join(self.tmp, "source")
+        os.makedirs(os.path.join(self.source, "segment"))
+        with open(os.path.join(self.source, "chroma.sqlite3"), "w") as f:
+            f.write("db")
+        with open(os.path.join(self.source, "segment", "data_level0.bin"), "w") as f:
+            f.write("hnsw")
+        snapshot.write_state_file(os.path.join(self.source, snapshot.SEARCH_STATE_FILE), {"version": 1})
+        self.archive = os.path.join(self.tmp, "snap.tar.gz")
+
+    def test_write_and_restore(self):
+        snapshot.write_snapshot(self.archive, self.source, {"watermark": None})
+        target = os.path.join(self.tmp, "target")
+        os.makedirs(target)
+        with open(os.path.join(target, "old"), "w") as f:
+            f.write("old")
+
+        manifest = snapshot.restore_snapshot(self.archive, target)
+
+        self.assertEqual(manifest["version"], snapshot.SNAPSHOT_VERSION)
+        self.assertEqual(sorted(os.listdir(target)), ["chroma.sqlite3", "search_state.json.gz", "segment"])
+        with open(os.path.join(target, "segment", "data_level0.bin")) as f:
+            self.assertEqual(f.read(), "hnsw")
+        self.assertEqual(snapshot.read_state_file(os.path.join(target, snapshot.SEARCH_STATE_FILE)), {"version": 1})
+        self.assertFalse(os.path.exists(target + ".bak"))
+
+    def test_rejects_unsafe_paths(self):
+        snapshot.write_snapshot(self.archive, self.source)
+        with tarfile.open(self.archive, "r:gz") as tar:
+            members = [(m, tar.extractfile(m).read() if m.isfile() else None) for m in tar.getmembers()]
+        with tarfile.open(self.archive, "w:gz") as tar:
+            for m, data in members:
+                tar.addfile(m, io.BytesIO(data) if data is not None else None)
+            evil = tarfile.TarInfo("vector_data/../../evil")
+            evil.size = 4
+            tar.addfile(evil, io.BytesIO(b"evil"))
+
+        target = os.path.join(self.tmp, "target")
+        os.makedirs(target)
+        with self.assertRaises(ValueError):
+            snapshot.restore_snapshot(self.archive, target)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp, "evil")))
+        self.assertTrue(os.path.isdir(target))
+
+    def test_failed_swap_keeps_old_store(self):
+        snapshot.write_snapshot(self.archive, self.source)
+        target = os.path.join(self.tmp, "target")
+        os.makedirs(target)
+        with open(os.path.join(target, "old"), "w") as f:
+            f.write("old")
+
+        real_replace = os.replace
+
+        def replace(src, dst):
+            if os.path.basename(src) == snapshot.VECTOR_DATA_DIR:
+                raise OSError("disk full")
+            real_replace(src, dst)
+
+        with mock.patch("hrmatch.snapshot.os.replace", side_effect=replace):
+            with self.assertRaises(OSError):
+                snapshot.restore_snapshot(self.archive, target)
+
+        self.assertEqual(os.listdir(target), ["old"])
+        self.assertFalse(os.path.exists(target + ".bak"))
+
+    def test_rejects_non_snapshot(self):
+        with tarfile.open(self.archive, "w:gz") as tar:
+            data = b'{"format": "something-else", "version": 1}'
+            info = tarfile.TarInfo(snapshot.MANIFEST_FILE)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+        with self.assertRaises(ValueError):
+            snapshot.read_manifest(self.archive)
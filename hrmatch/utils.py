@@ -1,19 +1,25 @@
 import os
 import re
 import json
+import time
 import base64
 import fitz
 import pymongo
 import logging
 import warnings
+import threading
 from bson import ObjectId
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from langchain.schema import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Chroma
-from llama_cpp import Llama
+from llama_cpp import Llama, LlamaGrammar
 from chatbot.offline_loader import OfflineSentenceTransformerEmbeddings
+from hrmatch.skills import SKILL_SYNONYMS, SkillVocabulary, matches_any_skill
+from hrmatch.snapshot import (
+    SEARCH_STATE_FILE, apply_search_state, dump_search_state, read_state_file, write_state_file
+)
 from django.conf import settings
 
 # ============================================================
@@ -23,6 +29,7 @@ logging.getLogger("llama_cpp").setLevel(logging.CRITICAL)
 logging.getLogger("chromadb").setLevel(logging.CRITICAL)
 logging.getLogger("chromadb.db.duckdb").setLevel(logging.CRITICAL)
 logging.getLogger("chromadb.telemetry").setLevel(logging.CRITICAL)
+logger = logging.getLogger("hrmatch")
 warnings.filterwarnings("ignore", category=UserWarning)
 warnings.filterwarnings("ignore", category=FutureWarning)
 
@@ -38,7 +45,7 @@ uploads_collection = db.get_collection("uploads")
 # Embedding Model & Vector DB
 # ============================================================
 embedding_model = OfflineSentenceTransformerEmbeddings()
-VECTOR_DB_PATH = "chatbot/vector_data"
+VECTOR_DB_PATH = settings.VECTOR_DB_PATH
 vector_db = None
 LOCAL_UPLOAD_FOLDER = r"E:\HRMS project\AndgatePortal\django_api\src\uploads"
 os.makedirs(LOCAL_UPLOAD_FOLDER, exist_ok=True)
@@ -66,87 +73,301 @@ def load_pdf_content(file_path: str) -> str:
 # ============================================================
 # Vector DB Initialization
 # ============================================================
+SYNC_INTERVAL_SECONDS = int(os.getenv("SYNC_INTERVAL_SECONDS", "60"))
+_last_sync = 0.0
+_sync_lock = threading.Lock()
+
 def initialize_vector_db():
     global vector_db
     if vector_db is None:
         vector_db = Chroma(persist_directory=VECTOR_DB_PATH, embedding_function=embedding_model)
+        load_search_state()
     sync_new_resumes()
     return vector_db
 
+def ensure_fresh_index():
+    """
+    Called before each search: opens the store on first use, then runs the
+    incremental sync (new/updated/deleted uploads plus the window roll) once
+    the last one is older than SYNC_INTERVAL_SECONDS. Concurrent requests
+    skip the sync instead of waiting for it.
+    """
+    if vector_db is None:
+        initialize_vector_db()
+        return
+    if time.monotonic() - _last_sync < SYNC_INTERVAL_SECONDS:
+        return
+    if not _sync_lock.acquire(blocking=False):
+        return
+    try:
+        sync_new_resumes()
+    except Exception as e:
+        logging.error(f"Background sync failed: {e}")
+    finally:
+        _sync_lock.release()
+
+def incremental_sync_query(watermark, last_id) -> dict:
+    """
+    Uploads created after `last_id` or updated since `watermark`, whether the
+    timestamp is stored as updatedAt or updated_at, as a date or an ISO string.
+    """
+    clauses = []
+    if last_id:
+        clauses.append({"_id": {"$gt": ObjectId(last_id)}})
+    if watermark:
+        for field in ("updatedAt", "updated_at"):
+            clauses.append({field: {"$gte": watermark}})
+            clauses.append({field: {"$gte": watermark.isoformat()}})
+    return {"$or": clauses}
+
 def sync_new_resumes():
-    global vector_db
+    """
+    Index new resumes and re-stamp updated ones. The first sync of a fresh
+    store scans every upload; afterwards (or after a snapshot import) only
+    uploads created after `sync_last_id` or updated since `sync_watermark`
+    are read, plus a cheap id-only scan to drop deleted uploads.
+    """
+    global vector_db, sync_watermark, sync_last_id, _last_sync
     if vector_db is None:
         raise ValueError("Vector DB not initialized")
-
-    existing_ids = set(meta.get("upload_id") for meta in vector_db.get().get("metadatas", []) if meta)
+    _last_sync = time.monotonic()
+
+    full = sync_watermark is None and sync_last_id is None
+    query = {} if full else incremental_sync_query(sync_watermark, sync_last_id)
+    uploads = list(uploads_collection.find(query, {"file": 0}))
+    uids = [str(upload["_id"]) for upload in uploads]
+
+    if full:
+        stored = vector_db._collection.get(include=["metadatas"])
+    elif uids:
+        stored = vector_db._collection.get(where={"upload_id": {"$in": uids}}, include=["metadatas"])
+    else:
+        stored = {}
+
+    chunk_ids = {}
+    stored_ts = {}
+    for chunk_id, meta in zip(stored.get("ids", []), stored.get("metadatas", [])):
+        if not meta or not meta.get("upload_id"):
+            continue
+        chunk_ids.setdefault(meta["upload_id"], []).append(chunk_id)
+        stored_ts[meta["upload_id"]] = meta.get("updated_ts")
+
+    unseen = [uid for uid in chunk_ids if uid not in skill_vocab.documents]
+    if unseen:
+        chunk_texts = {}
+        stored_docs = vector_db._collection.get(where={"upload_id": {"$in": unseen}}, include=["metadatas", "documents"])
+        for meta, chunk in zip(stored_docs.get("metadatas", []), stored_docs.get("documents", [])):
+            chunk_texts.setdefault(meta["upload_id"], []).append(chunk or "")
+        for uid, chunks in chunk_texts.items():
+            skill_vocab.add_document(uid, "\n".join(chunks))
+
+    if full:
+        live = set(uids)
+        deleted = [uid for uid in chunk_ids if uid not in live]
+    else:
+        live = set(str(upload["_id"]) for upload in uploads_collection.find({}, {"_id": 1}))
+        deleted = [uid for uid in candidate_index if uid not in live]
+
+    index = {}
     new_docs = []
+    rolled_ids, rolled_metas = [], []
+    watermark = sync_watermark
+    last_id = ObjectId(sync_last_id) if sync_last_id else None
 
-    for upload in uploads_collection.find():
+    for upload in uploads:
         uid = str(upload["_id"])
-        if uid in existing_ids:
-            continue
-
         filename = upload.get("fileName", f"{uid}.pdf")
         local_path = os.path.join(LOCAL_UPLOAD_FOLDER, filename)
+        updated_at = parse_updated_at(upload.get("updatedAt") or upload.get("updated_at"))
+        updated_ts = to_timestamp(updated_at)
+        index[uid] = {
+            "filename": filename,
+            "file_path": upload.get("filePath") or local_path,
+            "updated_at": updated_at,
+            "updated_ts": updated_ts
+        }
+        if updated_at and (watermark is None or updated_at > watermark):
+            watermark = updated_at
+        if last_id is None or upload["_id"] > last_id:
+            last_id = upload["_id"]
+
+        if uid in chunk_ids:
+            # Roll the recency window: re-stamp chunks whose resume was updated
+            # (or which predate updated_ts) without re-embedding them.
+            if stored_ts.get(uid) != updated_ts:
+                meta = {"upload_id": uid, "filename": filename, "updated_ts": updated_ts}
+                rolled_ids.extend(chunk_ids[uid])
+                rolled_metas.extend(dict(meta) for _ in chunk_ids[uid])
+                candidate_features.pop(uid, None)
+            continue
 
-        if upload.get("file"):
-            try:
-                if not os.path.exists(local_path):
+        if not os.path.exists(local_path):
+            blob = uploads_collection.find_one({"_id": upload["_id"]}, {"file": 1}) or {}
+            if blob.get("file"):
+                try:
                     with open(local_path, "wb") as f:
-                        f.write(base64.b64decode(upload["file"]))
+                        f.write(base64.b64decode(blob["file"]))
                     uploads_collection.update_one({"_id": ObjectId(uid)}, {"$set": {"filePath": str(local_path)}})
-            except Exception:
-                continue
+                    index[uid]["file_path"] = local_path
+                except Exception:
+                    continue
 
         text = load_pdf_content(local_path)
         if not text:
             continue
 
+        skill_vocab.add_document(uid, text)
+        _store_candidate_features(uid, text, updated_ts)
         splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
         chunks = splitter.split_text(text)
-        docs = [Document(page_content=c, metadata={"upload_id": uid, "filename": filename}) for c in chunks]
+        docs = [Document(page_content=c, metadata={"upload_id": uid, "filename": filename, "updated_ts": updated_ts}) for c in chunks]
         new_docs.extend(docs)
 
+    if full:
+        candidate_index.clear()
+    candidate_index.update(index)
+    for uid in deleted:
+        candidate_index.pop(uid, None)
+        candidate_features.pop(uid, None)
+    last_id = str(last_id) if last_id else None
+    changed = full or bool(new_docs or rolled_ids or deleted) or (watermark, last_id) != (sync_watermark, sync_last_id)
+    sync_watermark = watermark
+    sync_last_id = last_id
+
+    if deleted:
+        vector_db._collection.delete(where={"upload_id": {"$in": deleted}})
+    if rolled_ids:
+        vector_db._collection.update(ids=rolled_ids, metadatas=rolled_metas)
     if new_docs:
         vector_db.add_documents(new_docs)
+    if rolled_ids or new_docs or deleted:
         vector_db.persist()
 
+    roll_recency_window()
+    if changed:
+        save_search_state()
+
 # ============================================================
-# Keyword Extractor
+# Recency Window
 # ============================================================
-def extract_keywords(query: str):
-    if not query:
-        return []
+RECENT_DAYS = 30
+MAX_RECENT_DAYS = 3650
+FEATURE_WINDOW_DAYS = int(os.getenv("FEATURE_WINDOW_DAYS", "90"))
+
+# upload_id -> {"filename", "file_path", "updated_at", "updated_ts"}, rebuilt by sync_new_resumes
+candidate_index = {}
+# upload_id -> {"content_lower", "experience_years", "skills", "vocab_version", "updated_ts"}, or None if unreadable
+candidate_features = {}
+
+def parse_updated_at(value):
+    """Normalise an updatedAt value (datetime or ISO string) to a naive UTC datetime."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
 
-    query = query.lower().strip()
-    tokens = query.split()
-    keywords = [query]
+def to_timestamp(value) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp() if value else 0.0
 
-    for n in range(3, 0, -1):
-        for i in range(len(tokens) - n + 1):
-            phrase = " ".join(tokens[i:i+n]).strip()
-            if len(phrase) > 2 and phrase not in keywords:
-                keywords.append(phrase)
+def recent_cutoff_ts(recent_days: int) -> float:
+    return to_timestamp(datetime.utcnow() - timedelta(days=recent_days))
 
-    GENERAL_NOISE = set([
-        "find", "top", "candidates", "with", "for", "the", "a", "an",
-        "of", "and", "or", "developer", "engineer", "candidate", "role", "looking"
-    ])
+def recency_filter(recent_days: int) -> dict:
+    """Chroma `where` clause restricting the ANN search to the active window."""
+    return {"updated_ts": {"$gte": recent_cutoff_ts(recent_days)}}
 
-    final_keywords = []
-    for kw in keywords:
-        if kw == query:
-            continue
-        is_technical = bool(re.search(r'[0-9\.\-#/]', kw))
-        is_pure_noise = all(word in GENERAL_NOISE for word in kw.split())
-        if (is_technical or not is_pure_noise) and len(kw) > 2:
-            final_keywords.append(kw)
+def _build_candidate_features(text: str, updated_ts: float) -> dict:
+    exp = extract_experience_years(text)
+    if exp < 0 or exp > 50:
+        exp = 0.0
+    return {
+        "content_lower": text.lower(),
+        "experience_years": exp,
+        "skills": set(skill_vocab.extract(text)),
+        "vocab_version": skill_vocab.version,
+        "updated_ts": updated_ts
+    }
+
+def _store_candidate_features(uid: str, text: str, updated_ts: float):
+    candidate_features[uid] = _build_candidate_features(text, updated_ts)
+
+def _candidate_skills(feature: dict) -> set:
+    """Skill set of a resume, re-extracted only if the vocabulary has grown since."""
+    if feature["vocab_version"] != skill_vocab.version:
+        feature["skills"] = set(skill_vocab.extract(feature["content_lower"]))
+        feature["vocab_version"] = skill_vocab.version
+    return feature["skills"]
 
-    return sorted(list(set(final_keywords)), key=len, reverse=True)
+def roll_recency_window():
+    """Evict feature rows that have aged out of FEATURE_WINDOW_DAYS."""
+    cutoff = recent_cutoff_ts(FEATURE_WINDOW_DAYS)
+    for uid in [uid for uid, entry in candidate_index.items() if entry["updated_ts"] < cutoff]:
+        candidate_features.pop(uid, None)
+    for uid in [uid for uid in candidate_features if uid not in candidate_index]:
+        del candidate_features[uid]
+
+# ============================================================
+# Search State
+# ============================================================
+SEARCH_STATE_PATH = os.path.join(VECTOR_DB_PATH, SEARCH_STATE_FILE)
+# Newest updatedAt and upload _id seen by sync_new_resumes; both None forces a full scan
+sync_watermark = None
+sync_last_id = None
+
+def export_search_state() -> dict:
+    return dump_search_state(sync_watermark, sync_last_id, candidate_index, candidate_features, skill_vocab)
+
+def import_search_state(state: dict):
+    global sync_watermark, sync_last_id
+    sync_watermark, sync_last_id = apply_search_state(state, candidate_index, candidate_features, skill_vocab)
+
+def save_search_state():
+    try:
+        write_state_file(SEARCH_STATE_PATH, export_search_state())
+    except Exception as e:
+        logging.error(f"Saving search state failed: {e}")
+
+def load_search_state():
+    global sync_watermark, sync_last_id
+    try:
+        state = read_state_file(SEARCH_STATE_PATH)
+        if state:
+            import_search_state(state)
+    except Exception as e:
+        logging.error(f"Loading search state failed, doing a full sync: {e}")
+        sync_watermark = None
+        sync_last_id = None
+
+def materialize_recency_window():
+    """Parse every resume inside FEATURE_WINDOW_DAYS so the feature table is complete."""
+    cutoff = recent_cutoff_ts(FEATURE_WINDOW_DAYS)
+    _load_candidate_features([uid for uid, entry in candidate_index.items() if entry["updated_ts"] >= cutoff], {})
+
+# ============================================================
+# Keyword Extractor
+# ============================================================
+skill_vocab = SkillVocabulary(SKILL_SYNONYMS)
+
+def extract_keywords(query: str):
+    if not query:
+        return []
+    return sorted(skill_vocab.extract(query), key=len, reverse=True)
 
 # ============================================================
 # LLM Initialization
 # ============================================================
+LLM_PREFIX_CACHE = os.getenv("LLM_PREFIX_CACHE", "1") != "0"
+# Loaded on the first HR query (see handle_hr_query), not at import time
+llm = None
+_prefix_states = {}
+_interpretation_grammar = None
+
 def initialize_llm():
     try:
         base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -158,6 +379,56 @@ def initialize_llm():
         logging.error(f"Error initializing LLM: {e}")
         return None
 
+def _prime_prefix(llm: Llama, name: str, prefix: str):
+    """
+    Restore the llama_cpp state (KV cache) for a static prompt prefix.
+    The prefix is evaluated once per model and snapshotted; llama_cpp then
+    only evaluates the tokens after the shared prefix on each call.
+    """
+    key = (id(llm), name)
+    state = _prefix_states.get(key)
+    if state is None:
+        llm.reset()
+        llm.eval(llm.tokenize(prefix.encode("utf-8")))
+        state = llm.save_state()
+        _prefix_states[key] = state
+    else:
+        llm.load_state(state)
+
+def get_interpretation_grammar():
+    global _interpretation_grammar
+    if _interpretation_grammar is None:
+        try:
+            _interpretation_grammar = LlamaGrammar.from_json_schema(json.dumps(INTERPRETATION_SCHEMA), verbose=False)
+        except Exception as e:
+            logging.error(f"Error building interpretation grammar: {e}")
+    return _interpretation_grammar
+
+def run_llm(llm: Llama, name: str, prefix: str, prompt: str, **kwargs) -> str:
+    """
+    Run a completion for prefix + prompt, reusing the cached prefix state and
+    logging time-to-first-token and tokens generated for the call.
+    """
+    if LLM_PREFIX_CACHE:
+        _prime_prefix(llm, name, prefix)
+
+    start = time.perf_counter()
+    ttft = None
+    tokens = 0
+    parts = []
+    for chunk in llm(prefix + prompt, stream=True, **kwargs):
+        if ttft is None:
+            ttft = time.perf_counter() - start
+        tokens += 1
+        parts.append(chunk["choices"][0]["text"])
+    total = time.perf_counter() - start
+
+    logger.info(
+        f"LLM [{name}] prefix_cache={LLM_PREFIX_CACHE} ttft={ttft or 0.0:.3f}s "
+        f"tokens={tokens} total={total:.3f}s"
+    )
+    return "".join(parts).strip()
+
 # ============================================================
 # Experience Extraction
 # ============================================================
@@ -203,23 +474,38 @@ def extract_experience_years(text: str) -> float:
 # ============================================================
 # Requirement Interpretation
 # ============================================================
-def interpret_requirement(query: str, llm: Llama):
-    prompt = f"""
+INTERPRETATION_PREFIX = """
 You are an AI HR recruiter assistant. Ignore any initial greetings (like 'Hi', 'Hello') in the query.
 Your task is to **ONLY** extract the key skills, required role, and top_k (if mentioned) from the main request.
 Be thorough and accurate.
 Return JSON ONLY:
-{{
+{
   "requirement_summary": "short summary",
   "skills": ["list", "of", "skills"],
   "role": "role name if any",
   "top_k": "integer or null"
-}}
-Query: "{query}"
+}
+"""
+
+INTERPRETATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "requirement_summary": {"type": "string"},
+        "skills": {"type": "array", "items": {"type": "string"}},
+        "role": {"type": "string"},
+        "top_k": {"type": ["integer", "null"]},
+    },
+    "required": ["requirement_summary", "skills", "role", "top_k"],
+}
+
+def interpret_requirement(query: str, llm: Llama):
+    prompt = f"""Query: "{query}"
 """
     try:
-        response = llm(prompt, max_tokens=512, temperature=0.2)
-        text = response["choices"][0]["text"].strip()
+        text = run_llm(
+            llm, "interpretation", INTERPRETATION_PREFIX, prompt,
+            max_tokens=512, temperature=0.2, grammar=get_interpretation_grammar()
+        )
         return json.loads(text)
     except Exception:
         match = re.search(r"top\s+(\d+)", query.lower())
@@ -233,104 +519,202 @@ Query: "{query}"
 # ============================================================
 # Candidate Search
 # ============================================================
-def search_candidates(requirement_text: str, page: int = 1, page_size: int = 20, top_k: int = None, skills: list = None):
-    global vector_db
-    if vector_db is None:
-        initialize_vector_db()
-
+SEARCH_K = 300
+BATCH_QUERY_SIZE = 64
+
+def _query_skills(requirement_text: str, skills: list = None):
+    """
+    Normalised skills to filter on. Without explicit skills only vocabulary
+    matches from the text are used; no skills means no skill filter.
+    """
     if not skills:
-        skills = re.findall(r"[a-zA-Z\+\#\.\-/]{3,}", requirement_text.lower())
+        skills = skill_vocab.extract(requirement_text)
+    return list(dict.fromkeys(skill_vocab.normalize(s) for s in skills if s.strip()))
+
+def _aggregate_hits(hits):
+    """Sum per-chunk relevance into one score per upload; hits are (metadata, distance) pairs."""
+    agg = {}
+    for meta, score in hits:
+        uid = (meta or {}).get("upload_id")
+        if not uid:
+            continue
+        rel = 1.0 / (1.0 + float(score)) if score is not None else 1.0
+        agg.setdefault(uid, {"score": 0, "filename": meta.get("filename")})
+        agg[uid]["score"] += rel
+    return agg
+
+def _window_size(where: dict) -> int:
+    return len(vector_db._collection.get(where=where, include=[]).get("ids", []))
+
+def _load_candidate_features(uids, transient: dict):
+    """
+    Make sure every upload in `uids` has an up-to-date feature row, parsing
+    the resume only when it is missing or has been updated. Rows inside
+    FEATURE_WINDOW_DAYS go into `candidate_features`; older ones (requests
+    with a longer recent_days) only go into the caller's `transient` dict, so
+    the shared table stays bounded by the window.
+    """
+    window_ts = recent_cutoff_ts(FEATURE_WINDOW_DAYS)
+    for uid in uids:
+        entry = candidate_index.get(uid)
+        if not entry:
+            continue
+        table = candidate_features if entry["updated_ts"] >= window_ts else transient
+        cached = table.get(uid, False)
+        if cached is None or (cached and cached["updated_ts"] == entry["updated_ts"]):
+            continue
 
-    skills = [s.lower().strip() for s in skills if s.strip()]
-    RECENT_DAYS = 30
-    recent_cutoff = datetime.utcnow() - timedelta(days=RECENT_DAYS)
+        resume_text = ""
+        file_path = entry.get("file_path")
+        if file_path and os.path.exists(file_path):
+            resume_text = load_pdf_content(file_path)
+        else:
+            try:
+                blob = uploads_collection.find_one({"_id": ObjectId(uid)}, {"file": 1}) or {}
+            except Exception:
+                blob = {}
+            if blob.get("file"):
+                resume_text = extract_text_from_pdf_base64(blob.get("file"))
 
-    try:
-        all_data = vector_db.get()
-        total_chunks = len(all_data.get("ids", []))
-        if total_chunks == 0:
-            return {"candidates": [], "total_count": 0}
+        if not resume_text.strip():
+            table[uid] = None
+            continue
 
-        search_k = min(300, total_chunks)
-        results = vector_db.similarity_search_with_score(requirement_text, k=search_k)
+        table[uid] = _build_candidate_features(resume_text, entry["updated_ts"])
 
-        agg = {}
-        for doc, score in results:
-            uid = doc.metadata.get("upload_id")
-            if not uid:
-                continue
-            rel = 1.0 / (1.0 + float(score)) if score is not None else 1.0
-            agg.setdefault(uid, {"score": 0, "filename": doc.metadata.get("filename")})
-            agg[uid]["score"] += rel
+def _rank_candidates(agg: dict, skills: list, cutoff_ts: float, transient: dict,
+                     page: int = 1, page_size: int = 20, top_k: int = None):
+    candidates = []
+    for uid, meta in agg.items():
+        entry = candidate_index.get(uid)
+        feature = candidate_features.get(uid) or transient.get(uid)
+        if not entry or not feature or entry["updated_ts"] < cutoff_ts:
+            continue
 
-        candidates = []
-        for uid, meta in agg.items():
-            try:
-                upload = uploads_collection.find_one({"_id": ObjectId(uid)})
-            except Exception:
-                continue
-            if not upload:
+        if skills:
+            if not matches_any_skill(skills, skill_vocab.skills, _candidate_skills(feature), feature["content_lower"]):
                 continue
 
-            updated_at = upload.get("updatedAt") or upload.get("updated_at")
-            if isinstance(updated_at, str):
-                try:
-                    updated_at = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
-                except:
-                    updated_at = None
+        candidates.append({
+            "id": uid,
+            "filename": meta.get("filename"),
+            "score": meta["score"],
+            "experience_years": feature["experience_years"],
+            "updated_at": entry["updated_at"]
+        })
 
-            if not updated_at or updated_at < recent_cutoff:
-                continue
+    if not candidates:
+        return {"candidates": [], "total_count": 0}
 
-            resume_text = ""
-            file_path = upload.get("filePath")
-            if file_path and os.path.exists(file_path):
-                resume_text = load_pdf_content(file_path)
-            elif upload.get("file"):
-                resume_text = extract_text_from_pdf_base64(upload.get("file"))
+    candidates = sorted(candidates, key=lambda c: (-c["experience_years"], -c["score"]))
+    total = len(candidates)
+    selected = candidates[:top_k] if top_k else candidates[(page - 1) * page_size: page * page_size]
 
-            if not resume_text.strip():
-                continue
+    return {"candidates": [{
+        "id": c["id"],
+        "filename": c["filename"],
+        "experience_years": c["experience_years"],
+        "last_updated": c["updated_at"].isoformat()
+    } for c in selected], "total_count": total}
 
-            if skills:
-                content_lower = resume_text.lower()
-                if not any(re.search(r'\b' + re.escape(s) + r'\b', content_lower) for s in skills):
-                    continue
-
-            exp = extract_experience_years(resume_text)
-            if exp < 0 or exp > 50:
-                exp = 0.0
+def search_candidates(requirement_text: str, page: int = 1, page_size: int = 20, top_k: int = None, skills: list = None,
+                      recent_days: int = RECENT_DAYS):
+    ensure_fresh_index()
 
-            candidates.append({
-                "id": uid,
-                "filename": meta.get("filename"),
-                "score": meta["score"],
-                "experience_years": exp,
-                "updated_at": updated_at
-            })
+    skills = _query_skills(requirement_text, skills)
+    where = recency_filter(recent_days)
+    cutoff_ts = where["updated_ts"]["$gte"]
 
-        if not candidates:
+    try:
+        window_chunks = _window_size(where)
+        if window_chunks == 0:
             return {"candidates": [], "total_count": 0}
 
-        candidates = sorted(candidates, key=lambda c: (-c["experience_years"], -c["score"]))
-        total = len(candidates)
-        selected = candidates[:top_k] if top_k else candidates[(page - 1) * page_size: page * page_size]
+        search_k = min(SEARCH_K, window_chunks)
+        results = vector_db.similarity_search_with_score(requirement_text, k=search_k, filter=where)
 
-        return {"candidates": [{
-            "id": c["id"],
-            "filename": c["filename"],
-            "experience_years": c["experience_years"],
-            "last_updated": c["updated_at"].isoformat()
-        } for c in selected], "total_count": total}
+        agg = _aggregate_hits((doc.metadata, score) for doc, score in results)
+        transient = {}
+        _load_candidate_features(agg.keys(), transient)
+        return _rank_candidates(agg, skills, cutoff_ts, transient, page=page, page_size=page_size, top_k=top_k)
 
     except Exception as e:
         logging.error(f"Search failed: {str(e)}")
         return {"error": f"Search failed: {str(e)}"}
 
+def search_candidates_batch(requirements: list, page_size: int = 20, top_k: int = None, recent_days: int = RECENT_DAYS):
+    """
+    Match many requirements at once. Requirements are dicts with a "query"
+    and optional "id", "skills" and "top_k". They are embedded and searched
+    in chunks of BATCH_QUERY_SIZE with one multi-query ANN call each, and
+    candidate features are looked up once and shared across the whole batch.
+    Yields one {"id", "query", "results"} dict per requirement, in order.
+    """
+    ensure_fresh_index()
+
+    where = recency_filter(recent_days)
+    cutoff_ts = where["updated_ts"]["$gte"]
+    search_k = min(SEARCH_K, _window_size(where))
+    transient = {}
+
+    for start in range(0, len(requirements), BATCH_QUERY_SIZE):
+        batch = requirements[start:start + BATCH_QUERY_SIZE]
+        texts = [(req.get("query") or "").strip() for req in batch]
+
+        hits_per_query = [[] for _ in batch]
+        error = None
+        try:
+            indexed = [i for i, text in enumerate(texts) if text]
+            if indexed and search_k:
+                embeddings = embedding_model.embed_documents([texts[i] for i in indexed])
+                res = vector_db._collection.query(
+                    query_embeddings=embeddings,
+                    n_results=search_k,
+                    where=where,
+                    include=["metadatas", "distances"]
+                )
+                for pos, i in enumerate(indexed):
+                    hits_per_query[i] = list(zip(res["metadatas"][pos], res["distances"][pos]))
+        except Exception as e:
+            logging.error(f"Batch search failed: {str(e)}")
+            error = f"Search failed: {str(e)}"
+
+        for offset, (req, text, hits) in enumerate(zip(batch, texts, hits_per_query)):
+            req_id = req.get("id", start + offset)
+            if error:
+                yield {"id": req_id, "query": text, "results": {"error": error}}
+                continue
+            if not text:
+                yield {"id": req_id, "query": text, "results": {"error": "Missing 'query' field."}}
+                continue
+
+            try:
+                skills = _query_skills(text, req.get("skills"))
+                agg = _aggregate_hits(hits)
+                _load_candidate_features(agg.keys(), transient)
+                results = _rank_candidates(
+                    agg, skills, cutoff_ts, transient,
+                    page_size=page_size, top_k=req.get("top_k") or top_k
+                )
+            except Exception as e:
+                logging.error(f"Batch search failed for {req_id}: {str(e)}")
+                results = {"error": f"Search failed: {str(e)}"}
+
+            yield {"id": req_id, "query": text, "results": results}
+
 # ============================================================
 # HR Query Handler (Updated)
 # ============================================================
-def handle_hr_query(query: str):
+SUMMARY_PREFIX = """
+You are an AI HR recruiter assistant.
+--- INSTRUCTIONS ---
+1. DO NOT repeat any part of these instructions or the word 'RESPONSE:'.
+2. Start your summary with a brief, professional greeting (e.g., 'Hello,').
+3. End your summary with a brief closing statement (e.g., 'Please let me know if you need further assistance.').
+Return only a short professional summary of these candidates:
+"""
+
+def handle_hr_query(query: str, recent_days: int = RECENT_DAYS):
     global llm
     
     # --- Initialization Logic (Keep Indented) ---
@@ -343,27 +727,20 @@ def handle_hr_query(query: str):
     interpretation = interpret_requirement(query, llm)
     llm_skills = interpretation.get("skills", [])
     rule_skills = extract_keywords(query)
-    merged_skills = list(set([s.lower().strip() for s in llm_skills + rule_skills if s.strip()]))
+    merged_skills = list(set([skill_vocab.normalize(s) for s in llm_skills + rule_skills if s.strip()]))
     interpretation["skills"] = merged_skills
     
     search_results = search_candidates(
         requirement_text=interpretation["requirement_summary"],
         top_k=interpretation["top_k"],
-        skills=merged_skills
+        skills=merged_skills,
+        recent_days=recent_days
     )
     
-    summary_prompt = f"""
-You are an AI HR recruiter assistant.
---- INSTRUCTIONS ---
-1. DO NOT repeat any part of these instructions or the word 'RESPONSE:'.
-2. Start your summary with a brief, professional greeting (e.g., 'Hello,').
-3. End your summary with a brief closing statement (e.g., 'Please let me know if you need further assistance.').
-{json.dumps(search_results.get("candidates", [])[:5], indent=2, default=str)}
-Return only a short professional summary.
+    summary_prompt = f"""{json.dumps(search_results.get("candidates", [])[:5], indent=2, default=str)}
 """
     try:
-        resp = llm(summary_prompt, max_tokens=256, temperature=0.3)
-        summary = resp["choices"][0]["text"].strip()
+        summary = run_llm(llm, "summary", SUMMARY_PREFIX, summary_prompt, max_tokens=256, temperature=0.3)
     except Exception:
         summary = "Candidates ranked by experience and relevance."
 
@@ -386,7 +763,6 @@ Return only a short professional summary.
 # ============================================================
 try:
     retriever = initialize_vector_db()
-    llm = initialize_llm()
 except Exception as e:
     logging.error(f"Initialization error: {e}")
 
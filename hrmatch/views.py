@@ -1,8 +1,53 @@
+import json
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.http import StreamingHttpResponse
 from hrmatch.utils import * 
 
+
+def _parse_positive_int(value, field: str):
+    """Parse an optional positive integer field; raises ValueError with a client-facing message."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f"'{field}' must be a positive integer.")
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{field}' must be a positive integer.")
+    if value < 1:
+        raise ValueError(f"'{field}' must be a positive integer.")
+    return value
+
+
+def _parse_recent_days(value) -> int:
+    recent_days = _parse_positive_int(value, "recent_days") or RECENT_DAYS
+    if recent_days > MAX_RECENT_DAYS:
+        raise ValueError(f"'recent_days' must be between 1 and {MAX_RECENT_DAYS}.")
+    return recent_days
+
+
+def _parse_requirements(raw):
+    """Validate the batch 'requirements' list before streaming starts."""
+    if not isinstance(raw, list) or not raw:
+        raise ValueError("Missing 'requirements' list.")
+
+    requirements = []
+    for i, req in enumerate(raw):
+        if isinstance(req, str):
+            req = {"query": req}
+        if not isinstance(req, dict):
+            raise ValueError(f"requirements[{i}] must be a string or an object.")
+        if not isinstance(req.get("query"), str) or not req["query"].strip():
+            raise ValueError(f"requirements[{i}].query must be a non-empty string.")
+        skills = req.get("skills")
+        if skills is not None and not (isinstance(skills, list) and all(isinstance(s, str) for s in skills)):
+            raise ValueError(f"requirements[{i}].skills must be a list of strings.")
+        requirements.append({**req, "top_k": _parse_positive_int(req.get("top_k"), f"requirements[{i}].top_k")})
+    return requirements
+
+
 class HRSearchAPIView(APIView):
     """
     POST API:
@@ -19,8 +64,13 @@ class HRSearchAPIView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
+            try:
+                recent_days = _parse_recent_days(request.data.get("recent_days"))
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
             # Call the main AI handler
-            result = handle_hr_query(query)
+            result = handle_hr_query(query, recent_days=recent_days)
 
             if "error" in result:
                 return Response(result, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -32,3 +82,32 @@ class HRSearchAPIView(APIView):
                 {"error": f"Something went wrong: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class HRBatchSearchAPIView(APIView):
+    """
+    POST API:
+    Takes many requirements (e.g. open job posts) and streams one ranked
+    candidate list per requirement back as NDJSON.
+    """
+
+    def post(self, request):
+        try:
+            try:
+                requirements = _parse_requirements(request.data.get("requirements"))
+                top_k = _parse_positive_int(request.data.get("top_k"), "top_k")
+                recent_days = _parse_recent_days(request.data.get("recent_days"))
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            lines = (
+                json.dumps(item, default=str) + "\n"
+                for item in search_candidates_batch(requirements, top_k=top_k, recent_days=recent_days)
+            )
+            return StreamingHttpResponse(lines, content_type="application/x-ndjson")
+
+        except Exception as e:
+            return Response(
+                {"error": f"Something went wrong: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )